@@ -6,16 +6,120 @@ Black regions are traced with spindle at -2mm, other regions at start height.
 
 from gcode_generator import GCodeGenerator
 from PIL import Image
+import numpy as np
 import sys
 
-def is_black(pixel, threshold=128):
-    if isinstance(pixel, (tuple, list)):
-        r, g, b = pixel[0], pixel[1], pixel[2]
-        brightness = (r + g + b) / 3
-    else:
-        brightness = pixel
+try:
+    import numba
+except ImportError:
+    numba = None
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _build_moves(arr, scale_x, scale_y, z_down, z_up, threshold):
+        """
+        Build the (x, y, z) move columns for an image in native code.
+
+        Two-pass kernel: the first pass samples the image and counts the
+        moves each row will emit, a prefix sum assigns each row its slice
+        of the output arrays, and the second pass writes rows in parallel.
+
+        Args:
+            arr: Resampled grayscale image as a (num_rows, num_cols)
+                uint8 array
+            scale_x: Output millimeters per column
+            scale_y: Output millimeters per row
+            z_down: Z height for black regions (mm)
+            z_up: Z height for non-black regions (mm)
+            threshold: Brightness below which a pixel counts as black
+
+        Returns:
+            Tuple of (move_x, move_y, move_z) float64 arrays
+        """
+        num_rows, num_cols = arr.shape
+
+        # Pass 1: threshold the grid and count transitions per row
+        mask = np.empty((num_rows, num_cols), dtype=np.uint8)
+        transitions = np.zeros(num_rows, dtype=np.int64)
+        for r in numba.prange(num_rows):
+            count = 0
+            for c in range(num_cols):
+                mask[r, c] = 1 if arr[r, c] < threshold else 0
+                if c > 0 and mask[r, c] != mask[r, c - 1]:
+                    count += 1
+            transitions[r] = count
+
+        # Z state entering each row is the last traversed cell of the
+        # previous row (serpentine traversal alternates direction)
+        entry_black = np.zeros(num_rows, dtype=np.uint8)
+        for r in range(1, num_rows):
+            if (r - 1) % 2 == 0:
+                entry_black[r] = mask[r - 1, num_cols - 1]
+            else:
+                entry_black[r] = mask[r - 1, 0]
+
+        # Moves per row: one per run, plus one Z move per Z change
+        counts = np.empty(num_rows, dtype=np.int64)
+        for r in range(num_rows):
+            if r % 2 == 0:
+                first_black = mask[r, 0]
+            else:
+                first_black = mask[r, num_cols - 1]
+            counts[r] = 2 * transitions[r] + 1
+            if first_black != entry_black[r]:
+                counts[r] += 1
+
+        offsets = np.zeros(num_rows, dtype=np.int64)
+        total = 0
+        for r in range(num_rows):
+            offsets[r] = total
+            total += counts[r]
+
+        out_x = np.empty(total, dtype=np.float64)
+        out_y = np.empty(total, dtype=np.float64)
+        out_z = np.empty(total, dtype=np.float64)
+
+        # Pass 2: emit each row's runs into its slice of the output
+        for r in numba.prange(num_rows):
+            write_idx = offsets[r]
+            row_y = r * scale_y
+            if r % 2 == 0:
+                start_c = 0
+                stop_c = num_cols
+                step = 1
+                prev_x = 0.0
+            else:
+                start_c = num_cols - 1
+                stop_c = -1
+                step = -1
+                prev_x = (num_cols - 1) * scale_x
+            prev_y = (r - 1) * scale_y if r > 0 else 0.0
+            cur_z = z_down if entry_black[r] == 1 else z_up
 
-    return brightness < threshold
+            c = start_c
+            run_black = mask[r, c]
+            while c != stop_c:
+                nxt = c + step
+                if nxt == stop_c or mask[r, nxt] != run_black:
+                    desired_z = z_down if run_black == 1 else z_up
+                    if desired_z != cur_z:
+                        out_x[write_idx] = prev_x
+                        out_y[write_idx] = prev_y
+                        out_z[write_idx] = desired_z
+                        write_idx += 1
+                        cur_z = desired_z
+                    end_x = c * scale_x
+                    out_x[write_idx] = end_x
+                    out_y[write_idx] = row_y
+                    out_z[write_idx] = cur_z
+                    write_idx += 1
+                    prev_x = end_x
+                    prev_y = row_y
+                    if nxt != stop_c:
+                        run_black = mask[r, nxt]
+                c = nxt
+
+        return out_x, out_y, out_z
 
 def image_to_gcode(image_path, output_path, z_down=-2.0, z_up=0.0, feed_rate=500,
                    output_width_mm=50, output_height_mm=50, num_rows=500, num_cols=500):
@@ -49,10 +153,14 @@ def image_to_gcode(image_path, output_path, z_down=-2.0, z_up=0.0, feed_rate=500
     print(f"Step size: {step_size_x:.2f}x{step_size_y:.2f} pixels")
     print(f"Resolution: {scale_x:.4f}x{scale_y:.4f} mm per point")
 
-    if img.mode != 'RGB':
-        img = img.convert('RGB')
+    if img.mode != 'L':
+        img = img.convert('L')
+
+    # PIL's C-level resize does the grid sampling in one cache-friendly
+    # pass; the result is exactly the num_rows x num_cols sampling grid
+    arr = np.asarray(img.resize((num_cols, num_rows), Image.NEAREST))
 
-    g = GCodeGenerator()
+    g = GCodeGenerator(include_move_comments=False)
 
     g.add_comment("=" * 50)
     g.add_comment(f"G-code generated from {image_path}")
@@ -74,57 +182,108 @@ def image_to_gcode(image_path, output_path, z_down=-2.0, z_up=0.0, feed_rate=500
 
     print("Generating G-code...")
 
-    current_z = z_up
-    total_moves = 0
-
-    for row_idx in range(num_rows):
-        if row_idx % 100 == 0:
-            print(f"Processing row {row_idx}/{num_rows}")
-            g.add_comment(f"Row {row_idx}")
-        pixel_y = int(row_idx * step_size_y)
-        if row_idx % 2 == 0:
-            col_indices = range(num_cols)
-        else:
-            col_indices = range(num_cols - 1, -1, -1)
-
-        for col_idx in col_indices:
-            pixel_x = int(col_idx * step_size_x)
-            pixel = img.getpixel((pixel_x, pixel_y))
-            if is_black(pixel):
-                desired_z = z_down
-            else:
-                desired_z = z_up
-            out_x = col_idx * scale_x
-            out_y = row_idx * scale_y
+    if numba is not None:
+        # JIT-compiled kernel: samples the grid, detects Z transitions,
+        # and emits the move columns in parallel over rows.
+        move_x, move_y, move_z = _build_moves(arr, scale_x, scale_y,
+                                              float(z_down), float(z_up), 128)
+    else:
+        # Fallback: vectorized sampling plus a per-row run-length loop.
+        black_mask = arr < 128
+
+        current_z = z_up
+        move_x = []
+        move_y = []
+        move_z = []
+        prev_x = 0.0
+        prev_y = 0.0
+
+        # Bind hot attributes as locals so the loop body skips the
+        # per-iteration attribute lookups
+        mx_append = move_x.append
+        my_append = move_y.append
+        mz_append = move_z.append
+        flatnonzero = np.flatnonzero
+        diff = np.diff
+
+        # Output X coordinate per column, plus a zero-copy reversed view
+        # for the right-to-left rows of the serpentine path
+        xs_out = np.arange(num_cols) * scale_x
+        xs_rev = xs_out[::-1]
+
+        # Process the mask in strips of rows so the strip being
+        # run-length encoded stays resident in cache, with one vectorized
+        # edge-detection pass per strip
+        strip_rows = 64
+        for strip_start in range(0, num_rows, strip_rows):
+            strip = black_mask[strip_start:strip_start + strip_rows]
+            strip_edges = diff(strip.astype(np.int8), axis=1)
+
+            for local_idx in range(strip.shape[0]):
+                row_idx = strip_start + local_idx
+                if row_idx % 100 == 0:
+                    print(f"Processing row {row_idx}/{num_rows}")
+                out_y = row_idx * scale_y
+
+                # Edges mark black/white transitions, so each run of
+                # constant Z collapses to a single move. Odd rows use
+                # reversed stride views instead of reversing the run list.
+                edges = flatnonzero(strip_edges[local_idx])
+                if row_idx % 2 == 0:
+                    row_mask = strip[local_idx]
+                    xs_row = xs_out
+                else:
+                    row_mask = strip[local_idx][::-1]
+                    xs_row = xs_rev
+                    edges = (num_cols - 2 - edges)[::-1]
+                bounds = [0, *(edges + 1), num_cols]
+
+                for run_start, run_end in zip(bounds[:-1], bounds[1:]):
+                    if row_mask[run_start]:
+                        desired_z = z_down
+                    else:
+                        desired_z = z_up
+
+                    # The far end of the run in traversal order
+                    out_x = xs_row[run_end - 1]
+
+                    if desired_z != current_z:
+                        mx_append(prev_x)
+                        my_append(prev_y)
+                        mz_append(desired_z)
+                        current_z = desired_z
+
+                    mx_append(out_x)
+                    my_append(out_y)
+                    mz_append(current_z)
+                    prev_x = out_x
+                    prev_y = out_y
 
-            if desired_z != current_z:
-                g.linear_move(z=desired_z, feed_rate=feed_rate)
-                current_z = desired_z
+        move_x = np.asarray(move_x)
+        move_y = np.asarray(move_y)
+        move_z = np.asarray(move_z)
 
-            g.linear_move(x=out_x, y=out_y, feed_rate=feed_rate)
-            total_moves += 1
+    g.linear_move_batch(move_x, move_y, move_z, feed_rate=feed_rate)
+    total_moves = len(move_x)
 
     print(f"Total moves: {total_moves}")
 
     g.add_comment("")
     g.add_comment("Return to safe position")
-    g.linear_move(z=z_up, feed_rate=feed_rate)
+    g.linear_move_z(z_up, feed_rate)
     g.rapid_move(x=0, y=0)
 
     g.add_comment("")
     g.program_end()
 
-    gcode = g.get_gcode()
-    with open(output_path, 'w') as f:
-        f.write(gcode)
+    g.write_to(output_path)
 
     print(f"\nG-code written to: {output_path}")
-    print(f"Total lines: {len(gcode.splitlines())}")
+    print(f"Total lines: {len(g.commands)}")
 
     svg_path = output_path.replace('.gcode', '.svg')
-    svg = g.get_svg(width=1000, height=1000)
-    with open(svg_path, 'w') as f:
-        f.write(svg)
+    with open(svg_path, 'w', buffering=1 << 20) as f:
+        f.write(g.get_svg(width=1000, height=1000))
     print(f"SVG visualization written to: {svg_path}")
 
 
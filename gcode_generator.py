@@ -1,8 +1,159 @@
+import io
+import math
+import shutil
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Type codes for the structure-of-arrays move history
+_TYPE_RAPID = 0
+_TYPE_LINEAR = 1
+_TYPE_ARC_CW = 2
+_TYPE_ARC_CCW = 3
+_TYPE_NAMES = ('rapid', 'linear', 'arc_cw', 'arc_ccw')
+
+# SVG element templates, hoisted so the emission loop formats each
+# element with a single C-level %-format call
+_SVG_RAPID_FMT = ('    <line x1="%.2f" y1="%.2f" x2="%.2f" y2="%.2f" '
+                  'stroke="#cccccc" stroke-dasharray="5,5"/>')
+_SVG_LINE_FMT = '    <line x1="%.2f" y1="%.2f" x2="%.2f" y2="%.2f" stroke="%s"/>'
+_SVG_ARC_FMT = ('    <path d="M %.2f,%.2f A %.2f,%.2f 0 %d,%d %.2f,%.2f" '
+                'fill="none" stroke="%s"/>')
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _svg_bounds(types, starts, ends, centers):
+        """
+        Bounds of the tool path as (min_x, min_y, max_x, max_y), scanned
+        in a single native pass over the history arrays. Arcs expand the
+        bounds to center +/- radius, the furthest the arc could reach.
+        """
+        min_x = min_y = np.inf
+        max_x = max_y = -np.inf
+        for idx in range(starts.shape[0]):
+            for arr in (starts, ends):
+                x = arr[idx, 0]
+                y = arr[idx, 1]
+                min_x = min(min_x, x)
+                max_x = max(max_x, x)
+                min_y = min(min_y, y)
+                max_y = max(max_y, y)
+            if types[idx] == _TYPE_ARC_CW or types[idx] == _TYPE_ARC_CCW:
+                center_x = starts[idx, 0] + centers[idx, 0]
+                center_y = starts[idx, 1] + centers[idx, 1]
+                radius = math.hypot(centers[idx, 0], centers[idx, 1])
+                min_x = min(min_x, center_x - radius)
+                max_x = max(max_x, center_x + radius)
+                min_y = min(min_y, center_y - radius)
+                max_y = max(max_y, center_y + radius)
+        return min_x, min_y, max_x, max_y
+
+    @numba.njit(cache=True)
+    def _svg_transform(xs, ys, min_x, min_y, scale, margin, height):
+        """
+        Map path coordinates to SVG pixel coordinates in a native loop
+        (Y is flipped because SVG Y increases downward).
+        """
+        n = xs.shape[0]
+        out_x = np.empty(n, dtype=np.float64)
+        out_y = np.empty(n, dtype=np.float64)
+        for i in range(n):
+            out_x[i] = margin + (xs[i] - min_x) * scale
+            out_y[i] = height - margin - (ys[i] - min_y) * scale
+        return out_x, out_y
+
+
 class GCodeGenerator:
-    def __init__(self):
-        self.commands = []
-        self.current_position = {'x': 0, 'y': 0, 'z': 0}
-        self.path_history = []
+    __slots__ = ('_buf', '_x', '_y', '_z', 'record_history',
+                 'include_move_comments', '_history_types', '_history_starts',
+                 '_history_ends', '_history_centers', '_history_len')
+
+    def __init__(self, record_history=True, capacity=1024,
+                 include_move_comments=True):
+        """
+        Args:
+            record_history: Record per-move history (needed for path_history
+                and get_svg); disable to skip history bookkeeping entirely
+            capacity: Initial capacity of the history arrays
+            include_move_comments: Append a descriptive comment to every
+                move line; disable to halve the formatting work and output
+                size for generated toolpaths
+        """
+        self._buf = io.StringIO()
+        self._x = self._y = self._z = 0.0
+        self.record_history = record_history
+        self.include_move_comments = include_move_comments
+        self._history_types = np.zeros(capacity, dtype=np.int8)
+        self._history_starts = np.zeros((capacity, 3), dtype=np.float64)
+        self._history_ends = np.zeros((capacity, 3), dtype=np.float64)
+        self._history_centers = np.zeros((capacity, 3), dtype=np.float64)
+        self._history_len = 0
+
+    @property
+    def commands(self):
+        """
+        Generated command lines as a list, split from the internal text
+        buffer on access. Commands are accumulated in a single buffer
+        rather than one Python string object per line.
+        """
+        return self._buf.getvalue().splitlines()
+
+    def _emit(self, line):
+        self._buf.write(line)
+        self._buf.write("\n")
+
+    @property
+    def current_position(self):
+        """Current tool position as a dict, built on demand."""
+        return {'x': self._x, 'y': self._y, 'z': self._z}
+
+    @property
+    def path_history(self):
+        """
+        Per-move history as a list of dicts, materialized on demand from
+        the internal structure-of-arrays storage.
+        """
+        history = []
+        for idx in range(self._history_len):
+            sx, sy, sz = self._history_starts[idx]
+            ex, ey, ez = self._history_ends[idx]
+            type_code = self._history_types[idx]
+            move = {
+                'type': _TYPE_NAMES[type_code],
+                'start': {'x': float(sx), 'y': float(sy), 'z': float(sz)},
+                'end': {'x': float(ex), 'y': float(ey), 'z': float(ez)}
+            }
+            if type_code in (_TYPE_ARC_CW, _TYPE_ARC_CCW):
+                ci, cj, ck = self._history_centers[idx]
+                move['center_offset'] = {'i': float(ci), 'j': float(cj), 'k': float(ck)}
+            history.append(move)
+        return history
+
+    def _reserve_history(self, count):
+        """Grow the history arrays to fit count more rows; return the base index."""
+        needed = self._history_len + count
+        capacity = len(self._history_types)
+        if needed > capacity:
+            while capacity < needed:
+                capacity *= 2
+            self._history_types = np.resize(self._history_types, capacity)
+            self._history_starts = np.resize(self._history_starts, (capacity, 3))
+            self._history_ends = np.resize(self._history_ends, (capacity, 3))
+            self._history_centers = np.resize(self._history_centers, (capacity, 3))
+        base = self._history_len
+        self._history_len = needed
+        return base
+
+    def _push_history(self, type_code, sx, sy, sz, ex, ey, ez, i=0.0, j=0.0, k=0.0):
+        idx = self._reserve_history(1)
+        self._history_types[idx] = type_code
+        self._history_starts[idx] = (sx, sy, sz)
+        self._history_ends[idx] = (ex, ey, ez)
+        self._history_centers[idx] = (i, j, k)
 
     def add_comment(self, text):
         """
@@ -12,62 +163,97 @@ class GCodeGenerator:
             text: Comment text to add
         """
         if text:
-            self.commands.append(f"; {text}")
+            self._emit(f"; {text}")
         else:
-            self.commands.append("")
+            self._emit("")
 
     def set_units_metric(self):
-        self.commands.append("G21 ; Set units to millimeters")
+        self._emit("G21 ; Set units to millimeters")
 
     def set_units_imperial(self):
-        self.commands.append("G20 ; Set units to inches")
+        self._emit("G20 ; Set units to inches")
 
     def set_absolute_positioning(self):
-        self.commands.append("G90 ; Set absolute positioning mode")
+        self._emit("G90 ; Set absolute positioning mode")
 
     def set_relative_positioning(self):
-        self.commands.append("G91 ; Set relative positioning mode")
+        self._emit("G91 ; Set relative positioning mode")
 
     def home_all_axes(self):
-        self.commands.append("$H ; Home all axes")
+        self._emit("$H ; Home all axes")
 
-    def rapid_move(self, x=None, y=None, z=None):
+    def _move(self, op, type_code, comment, x=None, y=None, z=None,
+              i=None, j=None, k=None, feed_rate=None):
         """
-        Rapid positioning move (G0).
+        Shared emission path for the G0/G1/G2/G3 move methods: one
+        axis-check/format/history sequence instead of four near-identical
+        copies.
 
         Args:
-            x: X coordinate (optional)
-            y: Y coordinate (optional)
-            z: Z coordinate (optional)
+            op: G-code word for the move ("G0".."G3")
+            type_code: History type code for the move
+            comment: Comment prefix, including the " ; " separator
+            x, y, z: Target coordinates (optional)
+            i, j, k: Offsets to the arc center (optional)
+            feed_rate: Feed rate in units per minute (optional)
         """
+        # No-op calls emit nothing, so return before the snapshot and
+        # list allocations below
+        if (x is None and y is None and z is None and i is None
+                and j is None and k is None and feed_rate is None):
+            return
+
         coords = []
-        comment_parts = []
-        start_pos = dict(self.current_position)
+        start_pos = (self._x, self._y, self._z)
 
         if x is not None:
-            coords.append(f"X{x:.4f}")
-            comment_parts.append(f"X={x:.4f}")
-            self.current_position['x'] = x
+            coords.append("X%.4f" % x)
+            self._x = x
 
         if y is not None:
-            coords.append(f"Y{y:.4f}")
-            comment_parts.append(f"Y={y:.4f}")
-            self.current_position['y'] = y
+            coords.append("Y%.4f" % y)
+            self._y = y
 
         if z is not None:
-            coords.append(f"Z{z:.4f}")
-            comment_parts.append(f"Z={z:.4f}")
-            self.current_position['z'] = z
+            coords.append("Z%.4f" % z)
+            self._z = z
+
+        if i is not None:
+            coords.append("I%.4f" % i)
+
+        if j is not None:
+            coords.append("J%.4f" % j)
+
+        if k is not None:
+            coords.append("K%.4f" % k)
+
+        if feed_rate is not None:
+            coords.append("F%.2f" % feed_rate)
 
         if coords:
             coord_str = " ".join(coords)
-            comment = f"Rapid move to {', '.join(comment_parts)}"
-            self.commands.append(f"G0 {coord_str} ; {comment}")
-            self.path_history.append({
-                'type': 'rapid',
-                'start': start_pos,
-                'end': dict(self.current_position)
-            })
+            if self.include_move_comments:
+                # Reuse the formatted axis tokens for the comment instead
+                # of formatting every value a second time
+                self._emit("".join((op, " ", coord_str, comment,
+                                    ", ".join(coords))))
+            else:
+                self._emit(op + " " + coord_str)
+            if self.record_history:
+                self._push_history(type_code, *start_pos,
+                                   self._x, self._y, self._z,
+                                   i or 0, j or 0, k or 0)
+
+    def rapid_move(self, x=None, y=None, z=None):
+        """
+        Rapid positioning move (G0).
+
+        Args:
+            x: X coordinate (optional)
+            y: Y coordinate (optional)
+            z: Z coordinate (optional)
+        """
+        self._move("G0", _TYPE_RAPID, " ; Rapid move to ", x, y, z)
 
     def linear_move(self, x=None, y=None, z=None, feed_rate=None):
         """
@@ -79,38 +265,88 @@ class GCodeGenerator:
             z: Z coordinate (optional)
             feed_rate: Feed rate in units per minute (optional)
         """
-        coords = []
-        comment_parts = []
-        start_pos = dict(self.current_position)
+        self._move("G1", _TYPE_LINEAR, " ; Linear move to ", x, y, z,
+                   feed_rate=feed_rate)
 
-        if x is not None:
-            coords.append(f"X{x:.4f}")
-            comment_parts.append(f"X={x:.4f}")
-            self.current_position['x'] = x
+    def linear_move_xy(self, x, y, feed_rate):
+        """
+        Linear interpolation move (G1) in X and Y only.
 
-        if y is not None:
-            coords.append(f"Y{y:.4f}")
-            comment_parts.append(f"Y={y:.4f}")
-            self.current_position['y'] = y
+        Specialized fast path for generated toolpaths where the call shape
+        is known: no per-axis None checks and a single format pass.
 
-        if z is not None:
-            coords.append(f"Z{z:.4f}")
-            comment_parts.append(f"Z={z:.4f}")
-            self.current_position['z'] = z
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            feed_rate: Feed rate in units per minute
+        """
+        self._emit("G1 X%.4f Y%.4f F%.2f" % (x, y, feed_rate))
+        if self.record_history:
+            self._push_history(_TYPE_LINEAR, self._x, self._y, self._z,
+                               x, y, self._z)
+        self._x = x
+        self._y = y
+
+    def linear_move_z(self, z, feed_rate):
+        """
+        Linear interpolation move (G1) in Z only.
 
-        if feed_rate is not None:
-            coords.append(f"F{feed_rate:.2f}")
-            comment_parts.append(f"feed={feed_rate:.2f}")
+        Specialized fast path for generated toolpaths where the call shape
+        is known: no per-axis None checks and a single format pass.
 
-        if coords:
-            coord_str = " ".join(coords)
-            comment = f"Linear move to {', '.join(comment_parts)}"
-            self.commands.append(f"G1 {coord_str} ; {comment}")
-            self.path_history.append({
-                'type': 'linear',
-                'start': start_pos,
-                'end': dict(self.current_position)
-            })
+        Args:
+            z: Z coordinate
+            feed_rate: Feed rate in units per minute
+        """
+        self._emit("G1 Z%.4f F%.2f" % (z, feed_rate))
+        if self.record_history:
+            self._push_history(_TYPE_LINEAR, self._x, self._y, self._z,
+                               self._x, self._y, z)
+        self._z = z
+
+    def linear_move_batch(self, xs, ys, zs, feed_rate=None):
+        """
+        Emit a batch of linear interpolation moves (G1) in one pass.
+
+        Intended for generated toolpaths with many moves: every line is
+        formatted in a single pass with no per-move comments, and the
+        history rows are written with vectorized array assignments.
+
+        Args:
+            xs: 1-D array of X coordinates
+            ys: 1-D array of Y coordinates
+            zs: 1-D array of Z coordinates
+            feed_rate: Feed rate in units per minute (optional)
+        """
+        if len(xs) == 0:
+            return
+
+        start_pos = (self._x, self._y, self._z)
+
+        if feed_rate is not None:
+            lines = ["G1 X%.4f Y%.4f Z%.4f F%.2f" % (x, y, z, feed_rate)
+                     for x, y, z in zip(xs, ys, zs)]
+        else:
+            lines = ["G1 X%.4f Y%.4f Z%.4f" % t for t in zip(xs, ys, zs)]
+        self._buf.write("\n".join(lines))
+        self._buf.write("\n")
+
+        if self.record_history:
+            count = len(xs)
+            base = self._reserve_history(count)
+            self._history_types[base:base + count] = _TYPE_LINEAR
+            ends = self._history_ends[base:base + count]
+            ends[:, 0] = xs
+            ends[:, 1] = ys
+            ends[:, 2] = zs
+            starts = self._history_starts[base:base + count]
+            starts[0] = start_pos
+            starts[1:] = ends[:-1]
+            self._history_centers[base:base + count] = 0.0
+
+        self._x = float(xs[-1])
+        self._y = float(ys[-1])
+        self._z = float(zs[-1])
 
     def arc_cw(self, x=None, y=None, z=None, i=None, j=None, k=None, feed_rate=None):
         """
@@ -125,51 +361,8 @@ class GCodeGenerator:
             k: Z offset from current position to arc center (optional)
             feed_rate: Feed rate in units per minute (optional)
         """
-        coords = []
-        comment_parts = []
-        start_pos = dict(self.current_position)
-
-        if x is not None:
-            coords.append(f"X{x:.4f}")
-            comment_parts.append(f"X={x:.4f}")
-            self.current_position['x'] = x
-
-        if y is not None:
-            coords.append(f"Y{y:.4f}")
-            comment_parts.append(f"Y={y:.4f}")
-            self.current_position['y'] = y
-
-        if z is not None:
-            coords.append(f"Z{z:.4f}")
-            comment_parts.append(f"Z={z:.4f}")
-            self.current_position['z'] = z
-
-        if i is not None:
-            coords.append(f"I{i:.4f}")
-            comment_parts.append(f"I={i:.4f}")
-
-        if j is not None:
-            coords.append(f"J{j:.4f}")
-            comment_parts.append(f"J={j:.4f}")
-
-        if k is not None:
-            coords.append(f"K{k:.4f}")
-            comment_parts.append(f"K={k:.4f}")
-
-        if feed_rate is not None:
-            coords.append(f"F{feed_rate:.2f}")
-            comment_parts.append(f"feed={feed_rate:.2f}")
-
-        if coords:
-            coord_str = " ".join(coords)
-            comment = f"Clockwise arc to {', '.join(comment_parts)}"
-            self.commands.append(f"G2 {coord_str} ; {comment}")
-            self.path_history.append({
-                'type': 'arc_cw',
-                'start': start_pos,
-                'end': dict(self.current_position),
-                'center_offset': {'i': i or 0, 'j': j or 0, 'k': k or 0}
-            })
+        self._move("G2", _TYPE_ARC_CW, " ; Clockwise arc to ", x, y, z,
+                   i, j, k, feed_rate)
 
     def arc_ccw(self, x=None, y=None, z=None, i=None, j=None, k=None, feed_rate=None):
         """
@@ -184,51 +377,8 @@ class GCodeGenerator:
             k: Z offset from current position to arc center (optional)
             feed_rate: Feed rate in units per minute (optional)
         """
-        coords = []
-        comment_parts = []
-        start_pos = dict(self.current_position)
-
-        if x is not None:
-            coords.append(f"X{x:.4f}")
-            comment_parts.append(f"X={x:.4f}")
-            self.current_position['x'] = x
-
-        if y is not None:
-            coords.append(f"Y{y:.4f}")
-            comment_parts.append(f"Y={y:.4f}")
-            self.current_position['y'] = y
-
-        if z is not None:
-            coords.append(f"Z{z:.4f}")
-            comment_parts.append(f"Z={z:.4f}")
-            self.current_position['z'] = z
-
-        if i is not None:
-            coords.append(f"I{i:.4f}")
-            comment_parts.append(f"I={i:.4f}")
-
-        if j is not None:
-            coords.append(f"J{j:.4f}")
-            comment_parts.append(f"J={j:.4f}")
-
-        if k is not None:
-            coords.append(f"K{k:.4f}")
-            comment_parts.append(f"K={k:.4f}")
-
-        if feed_rate is not None:
-            coords.append(f"F{feed_rate:.2f}")
-            comment_parts.append(f"feed={feed_rate:.2f}")
-
-        if coords:
-            coord_str = " ".join(coords)
-            comment = f"Counter-clockwise arc to {', '.join(comment_parts)}"
-            self.commands.append(f"G3 {coord_str} ; {comment}")
-            self.path_history.append({
-                'type': 'arc_ccw',
-                'start': start_pos,
-                'end': dict(self.current_position),
-                'center_offset': {'i': i or 0, 'j': j or 0, 'k': k or 0}
-            })
+        self._move("G3", _TYPE_ARC_CCW, " ; Counter-clockwise arc to ",
+                   x, y, z, i, j, k, feed_rate)
 
     def spindle_on_cw(self, rpm=None):
         """
@@ -238,9 +388,9 @@ class GCodeGenerator:
             rpm: Spindle speed in RPM (optional)
         """
         if rpm is not None:
-            self.commands.append(f"M3 S{rpm} ; Start spindle clockwise at {rpm} RPM")
+            self._emit(f"M3 S{rpm} ; Start spindle clockwise at {rpm} RPM")
         else:
-            self.commands.append("M3 ; Start spindle clockwise")
+            self._emit("M3 ; Start spindle clockwise")
 
     def spindle_on_ccw(self, rpm=None):
         """
@@ -250,12 +400,12 @@ class GCodeGenerator:
             rpm: Spindle speed in RPM (optional)
         """
         if rpm is not None:
-            self.commands.append(f"M4 S{rpm} ; Start spindle counter-clockwise at {rpm} RPM")
+            self._emit(f"M4 S{rpm} ; Start spindle counter-clockwise at {rpm} RPM")
         else:
-            self.commands.append("M4 ; Start spindle counter-clockwise")
+            self._emit("M4 ; Start spindle counter-clockwise")
 
     def spindle_off(self):
-        self.commands.append("M5 ; Stop spindle")
+        self._emit("M5 ; Stop spindle")
 
     def dwell(self, seconds):
         """
@@ -264,10 +414,10 @@ class GCodeGenerator:
         Args:
             seconds: Duration in seconds
         """
-        self.commands.append(f"G4 P{seconds:.2f} ; Dwell for {seconds:.2f} seconds")
+        self._emit(f"G4 P{seconds:.2f} ; Dwell for {seconds:.2f} seconds")
 
     def program_end(self):
-        self.commands.append("M30 ; End program")
+        self._emit("M30 ; End program")
 
     def get_gcode(self):
         """
@@ -276,7 +426,31 @@ class GCodeGenerator:
         Returns:
             String containing all G-code commands
         """
-        return "\n".join(self.commands)
+        value = self._buf.getvalue()
+        return value[:-1] if value else value
+
+    def write_gcode(self, f):
+        """
+        Write the generated G-code to an open file object straight from
+        the internal buffer, without building the joined string that
+        get_gcode returns.
+
+        Args:
+            f: Writable text-mode file object
+        """
+        self._buf.seek(0)
+        shutil.copyfileobj(self._buf, f)
+        self._buf.seek(0, io.SEEK_END)
+
+    def write_to(self, path):
+        """
+        Write the generated G-code to a file in a single buffered write.
+
+        Args:
+            path: Path to the output file
+        """
+        with open(path, 'w', buffering=1 << 20) as f:
+            self.write_gcode(f)
 
     def get_svg(self, width=800, height=600, margin=50):
         """
@@ -290,33 +464,38 @@ class GCodeGenerator:
         Returns:
             String containing SVG markup
         """
-        if not self.path_history:
+        n = self._history_len
+        if n == 0:
             return f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg"></svg>'
 
-        # Find bounds of the path
-        min_x = min_y = float('inf')
-        max_x = max_y = float('-inf')
-
-        for move in self.path_history:
-            for point in [move['start'], move['end']]:
-                min_x = min(min_x, point['x'])
-                max_x = max(max_x, point['x'])
-                min_y = min(min_y, point['y'])
-                max_y = max(max_y, point['y'])
-
-            # For arcs, also check the bounding box of the full arc
-            if move['type'] in ['arc_cw', 'arc_ccw']:
-                import math
-                center_x = move['start']['x'] + move['center_offset']['i']
-                center_y = move['start']['y'] + move['center_offset']['j']
-                radius = math.sqrt(move['center_offset']['i']**2 + move['center_offset']['j']**2)
-
-                # The arc could potentially reach center ± radius in each direction
-                # Check if these extremes are actually part of the arc
-                min_x = min(min_x, center_x - radius)
-                max_x = max(max_x, center_x + radius)
-                min_y = min(min_y, center_y - radius)
-                max_y = max(max_y, center_y + radius)
+        types = self._history_types[:n]
+        starts = self._history_starts[:n]
+        ends = self._history_ends[:n]
+        centers = self._history_centers[:n]
+        if numba is not None:
+            # One JIT-compiled pass over the history arrays
+            min_x, min_y, max_x, max_y = _svg_bounds(types, starts, ends,
+                                                     centers)
+        else:
+            # Find bounds of the path (one reduction over the history arrays)
+            all_x = np.concatenate([starts[:, 0], ends[:, 0]])
+            all_y = np.concatenate([starts[:, 1], ends[:, 1]])
+            min_x = float(all_x.min())
+            max_x = float(all_x.max())
+            min_y = float(all_y.min())
+            max_y = float(all_y.max())
+
+            # For arcs, also check the bounding box of the full arc: the
+            # arc could potentially reach center ± radius in each direction
+            arc_mask = (types == _TYPE_ARC_CW) | (types == _TYPE_ARC_CCW)
+            if arc_mask.any():
+                center_x = starts[arc_mask, 0] + centers[arc_mask, 0]
+                center_y = starts[arc_mask, 1] + centers[arc_mask, 1]
+                radius = np.hypot(centers[arc_mask, 0], centers[arc_mask, 1])
+                min_x = min(min_x, float((center_x - radius).min()))
+                max_x = max(max_x, float((center_x + radius).max()))
+                min_y = min(min_y, float((center_y - radius).min()))
+                max_y = max(max_y, float((center_y + radius).max()))
 
         # Calculate scale and offset
         path_width = max_x - min_x
@@ -332,12 +511,47 @@ class GCodeGenerator:
 
         scale = min(drawable_width / path_width, drawable_height / path_height)
 
-        def transform_x(x):
-            return margin + (x - min_x) * scale
-
-        def transform_y(y):
-            # Flip Y axis (SVG Y increases downward)
-            return height - margin - (y - min_y) * scale
+        # Transform every endpoint in one batch pass (Y is flipped
+        # because SVG Y increases downward); the loop below only formats
+        # strings
+        if numba is not None:
+            x1a, y1a = _svg_transform(starts[:, 0], starts[:, 1],
+                                      min_x, min_y, scale, margin, height)
+            x2a, y2a = _svg_transform(ends[:, 0], ends[:, 1],
+                                      min_x, min_y, scale, margin, height)
+            x1s = x1a.tolist()
+            y1s = y1a.tolist()
+            x2s = x2a.tolist()
+            y2s = y2a.tolist()
+        else:
+            x1s = (margin + (starts[:, 0] - min_x) * scale).tolist()
+            y1s = (height - margin - (starts[:, 1] - min_y) * scale).tolist()
+            x2s = (margin + (ends[:, 0] - min_x) * scale).tolist()
+            y2s = (height - margin - (ends[:, 1] - min_y) * scale).tolist()
+        # Blue for cutting moves (Z below 0), green for non-cutting moves
+        colors = np.where(ends[:, 2] < 0, "#0066cc", "#00cc66").tolist()
+        type_list = types.tolist()
+
+        # Arc geometry (radius, angle sweep, large-arc flag) computed for
+        # every arc in one vectorized pass; the loop below only indexes in
+        arc_mask = (types == _TYPE_ARC_CW) | (types == _TYPE_ARC_CCW)
+        arc_idx = 0
+        if arc_mask.any():
+            a_starts = starts[arc_mask]
+            a_ends = ends[arc_mask]
+            a_centers = centers[arc_mask]
+            a_cx = a_starts[:, 0] + a_centers[:, 0]
+            a_cy = a_starts[:, 1] + a_centers[:, 1]
+            arc_radii = (np.hypot(a_centers[:, 0], a_centers[:, 1])
+                         * scale).tolist()
+            start_ang = np.arctan2(a_starts[:, 1] - a_cy, a_starts[:, 0] - a_cx)
+            end_ang = np.arctan2(a_ends[:, 1] - a_cy, a_ends[:, 0] - a_cx)
+            # CW arcs sweep start->end going clockwise in G-code; the
+            # float % keeps the difference in [0, 2*pi)
+            angle_diff = np.where(types[arc_mask] == _TYPE_ARC_CW,
+                                  start_ang - end_ang,
+                                  end_ang - start_ang) % (2 * math.pi)
+            arc_large = (angle_diff > math.pi).astype(np.int64).tolist()
 
         # Build SVG
         svg_lines = [
@@ -347,90 +561,41 @@ class GCodeGenerator:
         ]
 
         # Draw paths
-        for move in self.path_history:
-            x1 = transform_x(move['start']['x'])
-            y1 = transform_y(move['start']['y'])
-            x2 = transform_x(move['end']['x'])
-            y2 = transform_y(move['end']['y'])
+        for idx, move_type in enumerate(type_list):
+            x1 = x1s[idx]
+            y1 = y1s[idx]
+            x2 = x2s[idx]
+            y2 = y2s[idx]
 
-            if move['type'] == 'rapid':
+            if move_type == _TYPE_RAPID:
                 # Rapid moves in light gray, dashed
-                svg_lines.append(
-                    f'    <line x1="{x1:.2f}" y1="{y1:.2f}" x2="{x2:.2f}" y2="{y2:.2f}" '
-                    f'stroke="#cccccc" stroke-dasharray="5,5"/>'
-                )
-            elif move['type'] in ['arc_cw', 'arc_ccw']:
-                # Arc moves
-                # Calculate center point
-                center_x = move['start']['x'] + move['center_offset']['i']
-                center_y = move['start']['y'] + move['center_offset']['j']
-                cx = transform_x(center_x)
-                cy = transform_y(center_y)
-
-                # Calculate radius
-                import math
-                radius = math.sqrt(move['center_offset']['i']**2 + move['center_offset']['j']**2) * scale
-
-                # Calculate angles
-                start_angle = math.atan2(move['start']['y'] - center_y, move['start']['x'] - center_x)
-                end_angle = math.atan2(move['end']['y'] - center_y, move['end']['x'] - center_x)
+                svg_lines.append(_SVG_RAPID_FMT % (x1, y1, x2, y2))
+            elif move_type in (_TYPE_ARC_CW, _TYPE_ARC_CCW):
+                # Arc moves; geometry was precomputed above
+                radius = arc_radii[arc_idx]
+                large_arc_flag = arc_large[arc_idx]
+                arc_idx += 1
 
                 # Determine sweep flag (1 for CW in SVG coordinates, 0 for CCW)
                 # Note: SVG Y-axis is flipped, so we need to invert the sweep direction
-                sweep_flag = 1 if move['type'] == 'arc_cw' else 0
-
-                # Determine if this is a large arc
-                if move['type'] == 'arc_cw':
-                    # Clockwise in G-code
-                    angle_diff = start_angle - end_angle
-                else:
-                    # Counter-clockwise in G-code
-                    angle_diff = end_angle - start_angle
-
-                # Normalize angle difference
-                while angle_diff < 0:
-                    angle_diff += 2 * math.pi
-                while angle_diff > 2 * math.pi:
-                    angle_diff -= 2 * math.pi
-
-                large_arc_flag = 1 if angle_diff > math.pi else 0
-
-                # Choose color based on Z depth
-                if move['end']['z'] < 0:
-                    color = "#0066cc"  # Blue for cutting
-                else:
-                    color = "#00cc66"  # Green for non-cutting moves
+                sweep_flag = 1 if move_type == _TYPE_ARC_CW else 0
 
                 # Draw arc using SVG path
-                svg_lines.append(
-                    f'    <path d="M {x1:.2f},{y1:.2f} A {radius:.2f},{radius:.2f} 0 '
-                    f'{large_arc_flag},{sweep_flag} {x2:.2f},{y2:.2f}" '
-                    f'fill="none" stroke="{color}"/>'
-                )
+                svg_lines.append(_SVG_ARC_FMT % (x1, y1, radius, radius,
+                                                 large_arc_flag, sweep_flag,
+                                                 x2, y2, colors[idx]))
             else:
-                # Linear moves in blue, solid
-                # Check if this is a cutting move (Z below 0)
-                if move['end']['z'] < 0:
-                    color = "#0066cc"  # Blue for cutting
-                else:
-                    color = "#00cc66"  # Green for non-cutting moves
-                svg_lines.append(
-                    f'    <line x1="{x1:.2f}" y1="{y1:.2f}" x2="{x2:.2f}" y2="{y2:.2f}" '
-                    f'stroke="{color}"/>'
-                )
+                # Linear moves
+                svg_lines.append(_SVG_LINE_FMT % (x1, y1, x2, y2, colors[idx]))
 
         # Draw start point
-        start = self.path_history[0]['start']
         svg_lines.append(
-            f'    <circle cx="{transform_x(start["x"]):.2f}" '
-            f'cy="{transform_y(start["y"]):.2f}" r="5" fill="green"/>'
+            f'    <circle cx="{x1s[0]:.2f}" cy="{y1s[0]:.2f}" r="5" fill="green"/>'
         )
 
         # Draw end point
-        end = self.path_history[-1]['end']
         svg_lines.append(
-            f'    <circle cx="{transform_x(end["x"]):.2f}" '
-            f'cy="{transform_y(end["y"]):.2f}" r="5" fill="red"/>'
+            f'    <circle cx="{x2s[-1]:.2f}" cy="{y2s[-1]:.2f}" r="5" fill="red"/>'
         )
 
         svg_lines.append('  </g>')
@@ -440,6 +605,6 @@ class GCodeGenerator:
 
     def clear(self):
         """Clear all generated commands."""
-        self.commands = []
-        self.current_position = {'x': 0, 'y': 0, 'z': 0}
-        self.path_history = []
+        self._buf = io.StringIO()
+        self._x = self._y = self._z = 0.0
+        self._history_len = 0